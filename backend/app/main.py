@@ -1,25 +1,25 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from app.models import Base
 from app.routes import admin, user
-from app.services.scheduler import start_scheduler
-from app.utils.db import engine, SessionLocal
+from app.services.scheduler import start_scheduler, stop_scheduler
 from fastapi.middleware.cors import CORSMiddleware
-from app.models import Team
-from seed_data import run_seed
+import os
 
-# Create all tables once on startup
-Base.metadata.create_all(bind=engine)
-# Auto-seed DB if there are no teams
-session = SessionLocal()
-if not session.query(Team).first():
-    run_seed()
-session.close()
+# "development" creates tables and auto-seeds an empty DB on import.
+# "production" does no DB work at import: run `python migrate.py` before deploying.
+APP_ENV = os.getenv("APP_ENV", "development")
+
+if APP_ENV != "production":
+    from app.utils.db import init_db
+    from seed_data import seed_if_empty
+    init_db()
+    seed_if_empty()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     start_scheduler()
     yield
+    stop_scheduler()
 
 app = FastAPI(title="AlertSphere API", version="0.1", lifespan=lifespan)
 
@@ -2,24 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models import Alert, SeverityEnum, DeliveryTypeEnum, VisibilityTypeEnum, Organization, Team, User, AlertTeam, AlertUser
-from app.schemas import AlertCreate, AlertUpdate, AlertOut, AnalyticsOut, OrganizationCreate, OrganizationOut, TeamCreate, TeamOut
+from app.schemas import AlertCreate, AlertUpdate, AlertOut, AnalyticsOut, OrganizationCreate, OrganizationOut, TeamCreate, TeamOut, UserOut
+from app.schemas import AlertListAdapter, OrganizationListAdapter, TeamListAdapter, UserListAdapter
 from app.services.analytics import get_analytics
-from app.services.scheduler import trigger_reminders
-from app.utils.db import SessionLocal
+from app.services.membership import get_membership
+from app.services.scheduler import dispatch_critical_alert, trigger_reminders
+from app.utils.db import get_db, get_write_db, pool_metrics
+from app.utils.responses import rows_as_dicts, rows_response, select_columns
 from datetime import datetime
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # --- Organization CRUD ---
 @router.post("/organizations", response_model=OrganizationOut)
-def create_organization(org: OrganizationCreate, db: Session = Depends(get_db)):
+def create_organization(org: OrganizationCreate, db: Session = Depends(get_write_db)):
     db_org = Organization(name=org.name)
     db.add(db_org)
     db.commit()
@@ -28,11 +24,12 @@ def create_organization(org: OrganizationCreate, db: Session = Depends(get_db)):
 
 @router.get("/organizations", response_model=List[OrganizationOut])
 def list_organizations(db: Session = Depends(get_db)):
-    return db.query(Organization).all()
+    rows = db.execute(select_columns(Organization, OrganizationOut))
+    return rows_response(rows_as_dicts(rows), OrganizationListAdapter)
 
 # --- Team CRUD ---
 @router.post("/teams", response_model=TeamOut)
-def create_team(team: TeamCreate, db: Session = Depends(get_db)):
+def create_team(team: TeamCreate, db: Session = Depends(get_write_db)):
     db_team = Team(name=team.name, organization_id=team.organization_id)
     db.add(db_team)
     db.commit()
@@ -41,11 +38,12 @@ def create_team(team: TeamCreate, db: Session = Depends(get_db)):
 
 @router.get("/teams", response_model=List[TeamOut])
 def list_teams(db: Session = Depends(get_db)):
-    return db.query(Team).all()
+    rows = db.execute(select_columns(Team, TeamOut))
+    return rows_response(rows_as_dicts(rows), TeamListAdapter)
 
 # --- Alert Creation with Propagation ---
 @router.post("/alerts", response_model=AlertOut)
-def create_alert(alert: AlertCreate, db: Session = Depends(get_db)):
+def create_alert(alert: AlertCreate, db: Session = Depends(get_write_db)):
     now = datetime.utcnow()
     if alert.visibility_type == VisibilityTypeEnum.org:
         # Propagate to all teams and users under the org
@@ -67,17 +65,18 @@ def create_alert(alert: AlertCreate, db: Session = Depends(get_db)):
         )
         db.add(db_alert)
         db.commit()
+        # Link to all teams and users under org using link tables (fresh: these rows are persisted).
+        # Loaded while the commit has released this session's connection, as the reload needs its own
+        membership = get_membership(fresh=True)
         db.refresh(db_alert)
-        # Link to all teams and users under org using link tables
-        teams = db.query(Team).filter(Team.organization_id == org.id).all()
-        for team in teams:
-            db_alert_team = AlertTeam(alert_id=db_alert.id, team_id=team.id)
+        for team_id in membership.teams_in_org(org.id):
+            db_alert_team = AlertTeam(alert_id=db_alert.id, team_id=team_id)
             db.add(db_alert_team)
-            users = db.query(User).filter(User.team_id == team.id).all()
-            for user in users:
-                db_alert_user = AlertUser(alert_id=db_alert.id, user_id=user.id)
+            for user_id in membership.users_in_team(team_id):
+                db_alert_user = AlertUser(alert_id=db_alert.id, user_id=user_id)
                 db.add(db_alert_user)
         db.commit()
+        dispatch_critical_alert(db_alert)
         return db_alert
     elif alert.visibility_type == VisibilityTypeEnum.team:
         # Propagate to all users in the team
@@ -100,14 +99,15 @@ def create_alert(alert: AlertCreate, db: Session = Depends(get_db)):
         )
         db.add(db_alert)
         db.commit()
+        membership = get_membership(fresh=True)
         db.refresh(db_alert)
         db_alert_team = AlertTeam(alert_id=db_alert.id, team_id=team.id)
         db.add(db_alert_team)
-        users = db.query(User).filter(User.team_id == team.id).all()
-        for user in users:
-            db_alert_user = AlertUser(alert_id=db_alert.id, user_id=user.id)
+        for user_id in membership.users_in_team(team.id):
+            db_alert_user = AlertUser(alert_id=db_alert.id, user_id=user_id)
             db.add(db_alert_user)
         db.commit()
+        dispatch_critical_alert(db_alert)
         return db_alert
     elif alert.visibility_type == VisibilityTypeEnum.user:
         # Assign only to that user
@@ -139,6 +139,7 @@ def create_alert(alert: AlertCreate, db: Session = Depends(get_db)):
             db_alert_team = AlertTeam(alert_id=db_alert.id, team_id=team.id)
             db.add(db_alert_team)
         db.commit()
+        dispatch_critical_alert(db_alert)
         return db_alert
     else:
         raise HTTPException(status_code=400, detail="Invalid visibility type")
@@ -150,28 +151,34 @@ def list_alerts(
     active: Optional[bool] = Query(None),
     audience: Optional[VisibilityTypeEnum] = Query(None)
 ):
-    query = db.query(Alert)
+    query = select_columns(Alert, AlertOut)
     if severity:
-        query = query.filter(Alert.severity == severity)
+        query = query.where(Alert.severity == severity)
     if active is not None:
-        query = query.filter(Alert.is_active == active)
+        query = query.where(Alert.is_active == active)
     if audience:
-        query = query.filter(Alert.visibility_type == audience)
-    return query.all()
+        query = query.where(Alert.visibility_type == audience)
+    return rows_response(rows_as_dicts(db.execute(query)), AlertListAdapter)
 
 @router.put("/alerts/{id}", response_model=AlertOut)
-def update_alert(id: int, alert: AlertUpdate, db: Session = Depends(get_db)):
+def update_alert(id: int, alert: AlertUpdate, db: Session = Depends(get_write_db)):
     db_alert = db.query(Alert).filter(Alert.id == id).first()
     if not db_alert:
         raise HTTPException(status_code=404, detail="Alert not found")
+    was_live_critical = db_alert.is_active and not db_alert.archived and db_alert.severity == SeverityEnum.critical
+    window = (db_alert.start_time, db_alert.expiry_time)
     for field, value in alert.dict(exclude_unset=True).items():
         setattr(db_alert, field, value)
     db.commit()
     db.refresh(db_alert)
+    # Re-activated or escalated to critical: fan out now rather than at the next sweep.
+    # A moved window re-times the pending fan-out (same job id, so it replaces the old one).
+    if not was_live_critical or (db_alert.start_time, db_alert.expiry_time) != window:
+        dispatch_critical_alert(db_alert)
     return db_alert
 
 @router.delete("/alerts/{id}")
-def archive_alert(id: int, db: Session = Depends(get_db)):
+def archive_alert(id: int, db: Session = Depends(get_write_db)):
     db_alert = db.query(Alert).filter(Alert.id == id).first()
     if not db_alert:
         raise HTTPException(status_code=404, detail="Alert not found")
@@ -189,6 +196,11 @@ def trigger_reminders_endpoint():
     trigger_reminders()
     return {"detail": "Reminders triggered"}
 
-@router.get("/users")
+@router.get("/pool-metrics")
+def pool_metrics_endpoint():
+    return pool_metrics()
+
+@router.get("/users", response_model=List[UserOut])
 def list_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+    rows = db.execute(select_columns(User, UserOut))
+    return rows_response(rows_as_dicts(rows), UserListAdapter)
@@ -1,67 +1,69 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.models import Alert, User, UserAlertPreference, NotificationDelivery, AlertTeam, AlertUser, VisibilityTypeEnum
-from app.schemas import AlertOut
+from app.models import Alert, UserAlertPreference, NotificationDelivery, AlertTeam, AlertUser, VisibilityTypeEnum
+from app.schemas import AlertOut, AlertListAdapter
+from app.services.membership import get_membership
 from app.services.notification import NotificationService
-from app.utils.db import SessionLocal
-from datetime import datetime
+from app.services.scheduler import schedule_snooze_wakeup
+from app.utils.db import get_user_db, get_write_db, mark_user_write
+from app.utils.responses import rows_as_dicts, rows_response, select_columns
+from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/user", tags=["User"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # For MVP, user_id is passed as query param (future: auth)
 @router.get("/alerts", response_model=List[AlertOut])
-def get_user_alerts(user_id: int, db: Session = Depends(get_db)):
+def get_user_alerts(user_id: int, db: Session = Depends(get_user_db)):
     now = datetime.utcnow()
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        return []
-    team_id = user.team_id
-    org_id = user.team.organization_id if user.team else None
+    membership = get_membership()
+    if not membership.has_user(user_id):
+        # The user may have been added by another worker since the snapshot was taken
+        membership = get_membership(fresh=True)
+        if not membership.has_user(user_id):
+            return []
+    team_id = membership.team_of(user_id)
+    org_id = membership.org_of(user_id)
     # Org-level alerts for user's org
-    org_alerts = db.query(Alert).filter(
+    org_alerts = db.execute(select_columns(Alert, AlertOut).where(
         Alert.is_active == True,
         Alert.archived == False,
         Alert.start_time <= now,
         Alert.expiry_time >= now,
         Alert.organization_id == org_id,
         Alert.visibility_type == VisibilityTypeEnum.org
-    ).all()
+    ))
     # Team-level alerts for user's team
     team_alert_ids = db.query(AlertTeam.alert_id).filter(AlertTeam.team_id == team_id).all()
     team_alert_ids = [a[0] for a in team_alert_ids]
-    team_alerts = db.query(Alert).filter(
+    team_alerts = db.execute(select_columns(Alert, AlertOut).where(
         Alert.is_active == True,
         Alert.archived == False,
         Alert.start_time <= now,
         Alert.expiry_time >= now,
         Alert.visibility_type == VisibilityTypeEnum.team,
         Alert.id.in_(team_alert_ids)
-    ).all()
+    ))
     # User-level alerts for user
     user_alert_ids = db.query(AlertUser.alert_id).filter(AlertUser.user_id == user_id).all()
     user_alert_ids = [a[0] for a in user_alert_ids]
-    user_alerts = db.query(Alert).filter(
+    user_alerts = db.execute(select_columns(Alert, AlertOut).where(
         Alert.is_active == True,
         Alert.archived == False,
         Alert.start_time <= now,
         Alert.expiry_time >= now,
         Alert.visibility_type == VisibilityTypeEnum.user,
         Alert.id.in_(user_alert_ids)
-    ).all()
+    ))
     # Merge and deduplicate
-    all_alerts = {a.id: a for a in org_alerts + team_alerts + user_alerts}
-    return list(all_alerts.values())
+    all_alerts = {}
+    for rows in (org_alerts, team_alerts, user_alerts):
+        for row in rows:
+            all_alerts[row.id] = row._asdict()
+    return rows_response(list(all_alerts.values()), AlertListAdapter)
 
 @router.put("/alerts/{id}/read")
-def mark_alert_read(id: int, user_id: int, read: bool = True, db: Session = Depends(get_db)):
+def mark_alert_read(id: int, user_id: int, read: bool = True, db: Session = Depends(get_write_db)):
     pref = db.query(UserAlertPreference).filter_by(user_id=user_id, alert_id=id).first()
     if not pref:
         pref = UserAlertPreference(user_id=user_id, alert_id=id)
@@ -72,21 +74,33 @@ def mark_alert_read(id: int, user_id: int, read: bool = True, db: Session = Depe
     else:
         service.mark_unread(pref)
     db.commit()
+    mark_user_write(user_id)
     return {"detail": f"Alert marked as {'read' if read else 'unread'}"}
 
 @router.put("/alerts/{id}/snooze")
-def snooze_alert(id: int, user_id: int, db: Session = Depends(get_db)):
+def snooze_alert(
+    id: int,
+    user_id: int,
+    minutes: Optional[int] = Query(None, gt=0, le=525600, description="Snooze length (up to a year); defaults to the rest of the day"),
+    db: Session = Depends(get_write_db)
+):
     pref = db.query(UserAlertPreference).filter_by(user_id=user_id, alert_id=id).first()
     if not pref:
         pref = UserAlertPreference(user_id=user_id, alert_id=id)
         db.add(pref)
+    until = datetime.utcnow() + timedelta(minutes=minutes) if minutes else None
     service = NotificationService(db)
-    service.snooze(pref)
+    service.snooze(pref, until)
     db.commit()
+    mark_user_write(user_id)
+    # Re-deliver exactly when this snooze expires
+    schedule_snooze_wakeup(user_id, id, pref.snoozed_until)
+    if minutes:
+        return {"detail": f"Alert snoozed until {pref.snoozed_until.isoformat()}"}
     return {"detail": "Alert snoozed for today"}
 
 @router.get("/alerts/snoozed", response_model=List[AlertOut])
-def snoozed_alerts(user_id: int, db: Session = Depends(get_db)):
+def snoozed_alerts(user_id: int, db: Session = Depends(get_user_db)):
     now = datetime.utcnow()
     prefs = db.query(UserAlertPreference).filter(
         UserAlertPreference.user_id == user_id,
@@ -96,5 +110,5 @@ def snoozed_alerts(user_id: int, db: Session = Depends(get_db)):
     alert_ids = [p.alert_id for p in prefs]
     if not alert_ids:
         return []
-    alerts = db.query(Alert).filter(Alert.id.in_(alert_ids)).all()
-    return alerts
+    alerts = db.execute(select_columns(Alert, AlertOut).where(Alert.id.in_(alert_ids)))
+    return rows_response(rows_as_dicts(alerts), AlertListAdapter)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, List, Dict
 from datetime import datetime
 from app.models import SeverityEnum, DeliveryTypeEnum, VisibilityTypeEnum
@@ -11,8 +11,7 @@ class OrganizationCreate(OrganizationBase):
 
 class OrganizationOut(OrganizationBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TeamBase(BaseModel):
     name: str
@@ -23,8 +22,13 @@ class TeamCreate(TeamBase):
 
 class TeamOut(TeamBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class UserOut(BaseModel):
+    id: int
+    name: str
+    team_id: Optional[int]
+    model_config = ConfigDict(from_attributes=True)
 
 class AlertCreate(BaseModel):
     title: str
@@ -40,19 +44,19 @@ class AlertCreate(BaseModel):
     user_id: Optional[int] = None
 
 class AlertUpdate(BaseModel):
-    title: Optional[str]
-    message: Optional[str]
-    severity: Optional[SeverityEnum]
-    delivery_type: Optional[DeliveryTypeEnum]
-    reminder_frequency: Optional[int]
-    start_time: Optional[datetime]
-    expiry_time: Optional[datetime]
-    visibility_type: Optional[VisibilityTypeEnum]
-    organization_id: Optional[int]
-    team_id: Optional[int]
-    user_id: Optional[int]
-    is_active: Optional[bool]
-    archived: Optional[bool]
+    title: Optional[str] = None
+    message: Optional[str] = None
+    severity: Optional[SeverityEnum] = None
+    delivery_type: Optional[DeliveryTypeEnum] = None
+    reminder_frequency: Optional[int] = None
+    start_time: Optional[datetime] = None
+    expiry_time: Optional[datetime] = None
+    visibility_type: Optional[VisibilityTypeEnum] = None
+    organization_id: Optional[int] = None
+    team_id: Optional[int] = None
+    user_id: Optional[int] = None
+    is_active: Optional[bool] = None
+    archived: Optional[bool] = None
 
 class AlertOut(BaseModel):
     id: int
@@ -69,8 +73,7 @@ class AlertOut(BaseModel):
     user_id: Optional[int]
     is_active: bool
     archived: bool
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AnalyticsOut(BaseModel):
     total_alerts: int
@@ -79,3 +82,8 @@ class AnalyticsOut(BaseModel):
     snoozed_per_alert: Dict[int, int]
     severity_breakdown: Dict[str, int]
 
+# List adapters: validate/serialize whole lists in pydantic-core without per-row model work in Python
+OrganizationListAdapter = TypeAdapter(List[OrganizationOut])
+TeamListAdapter = TypeAdapter(List[TeamOut])
+UserListAdapter = TypeAdapter(List[UserOut])
+AlertListAdapter = TypeAdapter(List[AlertOut])
@@ -0,0 +1,144 @@
+from array import array
+from typing import Dict, Iterable, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import os
+import threading
+import time
+from app.models import Organization, Team, User, VisibilityTypeEnum
+from app.utils.db import SessionLocal
+
+# Upper bound on staleness for writes made by other worker processes
+MEMBERSHIP_CACHE_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL", "300"))
+
+_EMPTY = array("i")
+
+class Membership:
+    """Immutable org -> teams -> users snapshot. Member lists are int arrays."""
+
+    def __init__(self, org_ids, team_org: Dict[int, Optional[int]], user_team: Dict[int, Optional[int]]):
+        self.org_ids = frozenset(org_ids)
+        self.team_org = team_org
+        self.user_team = user_team
+        org_teams: Dict[int, list] = {}
+        team_users: Dict[int, list] = {}
+        for team_id, org_id in team_org.items():
+            if org_id is not None:
+                org_teams.setdefault(org_id, []).append(team_id)
+        for user_id, team_id in user_team.items():
+            if team_id is not None:
+                team_users.setdefault(team_id, []).append(user_id)
+        self.org_teams = {o: array("i", sorted(t)) for o, t in org_teams.items()}
+        self.team_users = {t: array("i", sorted(u)) for t, u in team_users.items()}
+        self.org_users = {
+            o: array("i", sorted(u for t in teams for u in self.team_users.get(t, _EMPTY)))
+            for o, teams in self.org_teams.items()
+        }
+
+    def has_user(self, user_id: int) -> bool:
+        return user_id in self.user_team
+
+    def team_of(self, user_id: int) -> Optional[int]:
+        return self.user_team.get(user_id)
+
+    def org_of(self, user_id: int) -> Optional[int]:
+        team_id = self.user_team.get(user_id)
+        return self.team_org.get(team_id) if team_id is not None else None
+
+    def teams_in_org(self, org_id: Optional[int]) -> array:
+        return self.org_teams.get(org_id, _EMPTY)
+
+    def users_in_team(self, team_id: Optional[int]) -> array:
+        return self.team_users.get(team_id, _EMPTY)
+
+    def users_in_org(self, org_id: Optional[int]) -> array:
+        return self.org_users.get(org_id, _EMPTY)
+
+    def audience(
+        self,
+        visibility_type: VisibilityTypeEnum,
+        organization_id: Optional[int] = None,
+        team_ids: Iterable[int] = (),
+        user_ids: Iterable[int] = (),
+    ) -> array:
+        """User ids an alert with this visibility reaches."""
+        if visibility_type == VisibilityTypeEnum.org:
+            return self.users_in_org(organization_id)
+        if visibility_type == VisibilityTypeEnum.team:
+            members = set()
+            for team_id in team_ids:
+                members.update(self.users_in_team(team_id))
+            return array("i", sorted(members))
+        if visibility_type == VisibilityTypeEnum.user:
+            return array("i", sorted(u for u in set(user_ids) if u in self.user_team))
+        return _EMPTY
+
+class MembershipCache:
+    """Loads the membership graph once per process and reloads it after org/team/user writes.
+
+    Always loads through its own primary session: a caller's session may be
+    routed to a lagging replica, and a stale snapshot would stick for the TTL.
+    """
+
+    def __init__(self, ttl: float = MEMBERSHIP_CACHE_TTL):
+        self.ttl = ttl
+        self._snapshot: Optional[Membership] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, fresh: bool = False) -> Membership:
+        requested_at = time.monotonic()
+        snapshot = self._snapshot
+        if not fresh and snapshot is not None and requested_at - self._loaded_at < self.ttl:
+            return snapshot
+        with self._lock:
+            # Concurrent fresh requests share one reload that began after they asked
+            reloaded = self._snapshot is not None and self._loaded_at >= requested_at
+            if (fresh and not reloaded) or self._snapshot is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._snapshot = self._load()
+                self._loaded_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    @staticmethod
+    def _load() -> Membership:
+        db = SessionLocal()
+        try:
+            org_ids = [row[0] for row in db.query(Organization.id)]
+            team_org = {team_id: org_id for team_id, org_id in db.query(Team.id, Team.organization_id)}
+            user_team = {user_id: team_id for user_id, team_id in db.query(User.id, User.team_id)}
+        finally:
+            db.close()
+        return Membership(org_ids, team_org, user_team)
+
+membership_cache = MembershipCache()
+
+def get_membership(fresh: bool = False) -> Membership:
+    """Single entry point for org/team/user membership lookups.
+
+    Pass fresh=True when the result is persisted (e.g. alert link rows), so a
+    snapshot that is stale from another worker's writes is never written down.
+    """
+    return membership_cache.get(fresh)
+
+# --- Invalidation: flag ORM writes to memberships, drop the cache once they commit ---
+def _flag_membership_write(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["membership_dirty"] = True
+
+for _model in (Organization, Team, User):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _flag_membership_write)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("membership_dirty", False):
+        membership_cache.invalidate()
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_flag_after_rollback(session, previous_transaction):
+    session.info.pop("membership_dirty", None)
@@ -7,15 +7,15 @@ from datetime import datetime, timedelta
 # --- Strategy Pattern: Notification Channel ---
 class NotificationChannel(ABC):
     @abstractmethod
-    def send(self, db: Session, user: User, alert: Alert) -> None:
+    def send(self, db: Session, user_id: int, alert: Alert) -> None:
         pass
 
 class InAppNotificationChannel(NotificationChannel):
-    def send(self, db: Session, user: User, alert: Alert) -> None:
+    def send(self, db: Session, user_id: int, alert: Alert) -> None:
         # Create a NotificationDelivery record
         delivery = NotificationDelivery(
             alert_id=alert.id,
-            user_id=user.id,
+            user_id=user_id,
             delivered_at=datetime.utcnow(),
             read_status=False,
             reminder_count=1
@@ -55,10 +55,13 @@ class UnreadState(AlertState):
         db.commit()
 
 class SnoozedState(AlertState):
+    def __init__(self, until: Optional[datetime] = None):
+        self.until = until
+
     def handle(self, db: Session, user_pref: UserAlertPreference) -> None:
-        # Snooze until end of current day
+        # Snooze until the given time, or end of current day by default
         now = datetime.utcnow()
-        snooze_until = datetime(now.year, now.month, now.day, 23, 59, 59)
+        snooze_until = self.until or datetime(now.year, now.month, now.day, 23, 59, 59)
         user_pref.snoozed_until = snooze_until
         db.commit()
 
@@ -68,8 +71,8 @@ class NotificationService:
         self.db = db
         self.channel = InAppNotificationChannel()  # MVP: only in-app
 
-    def deliver_alert(self, user: User, alert: Alert) -> None:
-        self.channel.send(self.db, user, alert)
+    def deliver_alert(self, user_id: int, alert: Alert) -> None:
+        self.channel.send(self.db, user_id, alert)
 
     def mark_read(self, user_pref: UserAlertPreference) -> None:
         ReadState().handle(self.db, user_pref)
@@ -77,6 +80,6 @@ class NotificationService:
     def mark_unread(self, user_pref: UserAlertPreference) -> None:
         UnreadState().handle(self.db, user_pref)
 
-    def snooze(self, user_pref: UserAlertPreference) -> None:
-        SnoozedState().handle(self.db, user_pref)
+    def snooze(self, user_pref: UserAlertPreference, until: Optional[datetime] = None) -> None:
+        SnoozedState(until).handle(self.db, user_pref)
 
@@ -1,27 +1,61 @@
-from apscheduler.schedulers.background import BackgroundScheduler
 from sqlalchemy.orm import Session
-from datetime import datetime
-from app.models import Alert, User, UserAlertPreference
+from datetime import datetime, timezone
+from typing import Optional
+import threading
+from app.models import Alert, NotificationDelivery, SeverityEnum, UserAlertPreference
+from app.services.membership import Membership, get_membership
 from app.services.notification import NotificationService
-from app.utils.db import SessionLocal
+from app.utils.db import SessionLocal, WriteSessionLocal
 
-scheduler = BackgroundScheduler()
+# Created on first start so importing this module stays cheap
+scheduler = None
+_scheduler_lock = threading.Lock()
 
-# --- Helper: Get target users for an alert ---
-def get_target_users(db: Session, alert: Alert) -> list:
+# --- Helper: Get target user ids for an alert (resolved from the membership cache) ---
+def get_target_users(membership: Membership, alert: Alert) -> list:
     if alert.visibility_type.name == "org":
-        return db.query(User).all()
+        return list(membership.audience(alert.visibility_type, organization_id=alert.organization_id))
     elif alert.visibility_type.name == "team":
         team_ids = [at.team_id for at in alert.teams]
-        return db.query(User).filter(User.team_id.in_(team_ids)).all()
+        return list(membership.audience(alert.visibility_type, team_ids=team_ids))
     elif alert.visibility_type.name == "user":
         user_ids = [au.user_id for au in alert.users]
-        return db.query(User).filter(User.id.in_(user_ids)).all()
+        return list(membership.audience(alert.visibility_type, user_ids=user_ids))
     return []
 
+def is_deliverable(alert: Optional[Alert], now: datetime) -> bool:
+    return (
+        alert is not None
+        and alert.is_active
+        and not alert.archived
+        and alert.start_time <= now <= alert.expiry_time
+    )
+
+def deliver_to_audience(db: Session, write_db: Session, membership: Membership, alert: Alert, now: datetime) -> int:
+    """Deliver one alert to every non-snoozed member of its audience; returns deliveries made."""
+    snoozed = {
+        user_id for (user_id,) in db.query(UserAlertPreference.user_id).filter(
+            UserAlertPreference.alert_id == alert.id,
+            UserAlertPreference.snoozed_until != None,
+            UserAlertPreference.snoozed_until > now
+        )
+    }
+    service = NotificationService(write_db)
+    delivered = 0
+    for user_id in get_target_users(membership, alert):
+        if user_id in snoozed:
+            continue  # Its wake-up timer re-delivers when the snooze expires
+        service.deliver_alert(user_id, alert)
+        delivered += 1
+    return delivered
+
 # --- Reminder Job ---
 def reminder_job():
+    # Resolve membership before checking out a connection: a reload needs its own
+    membership = get_membership()
+    # Reads use a pooled read session; deliveries go through the single writer
     db = SessionLocal()
+    write_db = WriteSessionLocal()
     now = datetime.utcnow()
     alerts = db.query(Alert).filter(
         Alert.is_active == True,
@@ -30,24 +64,120 @@ def reminder_job():
         Alert.expiry_time >= now
     ).all()
     for alert in alerts:
-        users = get_target_users(db, alert)
-        for user in users:
-            # Check snooze
-            pref = db.query(UserAlertPreference).filter_by(user_id=user.id, alert_id=alert.id).first()
-            if pref and pref.snoozed_until and pref.snoozed_until > now:
-                continue  # Snoozed for today
-            # Deliver notification
-            service = NotificationService(db)
-            service.deliver_alert(user, alert)
+        deliver_to_audience(db, write_db, membership, alert, now)
+    write_db.close()
+    db.close()
+
+# --- Priority lane: immediate fan-out of one critical alert ---
+def critical_alert_job(alert_id: int):
+    membership = get_membership()
+    db = SessionLocal()
+    write_db = WriteSessionLocal()
+    now = datetime.utcnow()
+    alert = db.get(Alert, alert_id)
+    if is_deliverable(alert, now) and alert.severity == SeverityEnum.critical:
+        deliver_to_audience(db, write_db, membership, alert, now)
+    write_db.close()
+    db.close()
+
+# --- Snooze wake-up: re-deliver one alert to one user when the snooze expires ---
+def snooze_wakeup_job(user_id: int, alert_id: int):
+    db = SessionLocal()
+    write_db = WriteSessionLocal()
+    now = datetime.utcnow()
+    pref = db.query(UserAlertPreference).filter_by(user_id=user_id, alert_id=alert_id).first()
+    alert = db.get(Alert, alert_id)
+    # Skip if the snooze was cleared or extended since this timer was set
+    if pref and pref.snoozed_until and pref.snoozed_until <= now and is_deliverable(alert, now):
+        # Every worker holds this timer; only the first to fire delivers
+        already_woken = write_db.query(NotificationDelivery.id).filter(
+            NotificationDelivery.user_id == user_id,
+            NotificationDelivery.alert_id == alert_id,
+            NotificationDelivery.delivered_at >= pref.snoozed_until
+        ).first()
+        if already_woken is None:
+            NotificationService(write_db).deliver_alert(user_id, alert)
+    write_db.close()
     db.close()
 
-# --- Schedule the job every 2 hours ---
-scheduler.add_job(reminder_job, 'interval', hours=2, id='reminder_job', replace_existing=True)
+def _utc(dt: datetime) -> datetime:
+    # Models store naive UTC; APScheduler would read naive datetimes as local time
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+def dispatch_critical_alert(alert: Alert) -> None:
+    """Queue a targeted fan-out for a critical alert, at its start time if that is still ahead."""
+    if alert.severity != SeverityEnum.critical or not alert.is_active or alert.archived:
+        return
+    get_scheduler().add_job(
+        critical_alert_job,
+        'date',
+        run_date=_utc(max(alert.start_time, datetime.utcnow())),
+        args=[alert.id],
+        id=f'critical:{alert.id}',
+        replace_existing=True,
+        misfire_grace_time=None,
+    )
+
+def schedule_snooze_wakeup(user_id: int, alert_id: int, until: datetime) -> None:
+    """Set (or move) the wake-up timer for one user's snooze of one alert."""
+    get_scheduler().add_job(
+        snooze_wakeup_job,
+        'date',
+        run_date=_utc(until),
+        args=[user_id, alert_id],
+        id=f'wake:{user_id}:{alert_id}',
+        replace_existing=True,
+        misfire_grace_time=None,
+    )
+
+def schedule_pending_wakeups() -> None:
+    """Rebuild wake-up timers for snoozes still running (timers live in memory only)."""
+    db = SessionLocal()
+    now = datetime.utcnow()
+    prefs = db.query(UserAlertPreference).filter(
+        UserAlertPreference.snoozed_until != None,
+        UserAlertPreference.snoozed_until > now
+    ).all()
+    for pref in prefs:
+        schedule_snooze_wakeup(pref.user_id, pref.alert_id, pref.snoozed_until)
+    db.close()
+
+def schedule_pending_critical_alerts() -> None:
+    """Rebuild fan-outs for critical alerts whose start time is still ahead."""
+    db = SessionLocal()
+    alerts = db.query(Alert).filter(
+        Alert.severity == SeverityEnum.critical,
+        Alert.is_active == True,
+        Alert.archived == False,
+        Alert.start_time > datetime.utcnow()
+    ).all()
+    for alert in alerts:
+        dispatch_critical_alert(alert)
+    db.close()
+
+# --- Lazily build the scheduler and schedule the job every 2 hours ---
+def get_scheduler():
+    global scheduler
+    # Request threads may get here (dispatch/snooze) before startup; build it exactly once
+    with _scheduler_lock:
+        if scheduler is None:
+            from apscheduler.schedulers.background import BackgroundScheduler
+            new_scheduler = BackgroundScheduler(job_defaults={'coalesce': True})
+            new_scheduler.add_job(reminder_job, 'interval', hours=2, id='reminder_job', replace_existing=True)
+            scheduler = new_scheduler
+        return scheduler
 
 # --- Start scheduler (to be called in app startup) ---
 def start_scheduler():
-    if not scheduler.running:
-        scheduler.start()
+    sched = get_scheduler()
+    if not sched.running:
+        schedule_pending_wakeups()
+        schedule_pending_critical_alerts()
+        sched.start()
+
+def stop_scheduler():
+    if scheduler is not None and scheduler.running:
+        scheduler.shutdown(wait=False)
 
 # --- Manual trigger for API endpoint ---
 def trigger_reminders():
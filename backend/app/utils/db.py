@@ -1,14 +1,226 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, Delete, Insert, Update
+from sqlalchemy.orm import Session, sessionmaker
+import itertools
 import os
+import threading
+import time
+from typing import Dict, Optional
 from sqlalchemy.engine.url import make_url
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./alertsphere.db")
+# Comma-separated read replicas; GET handlers read from these when set
+DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
 
-connect_args = {}
-if make_url(DATABASE_URL).get_backend_name() == "sqlite":
-    connect_args = {"check_same_thread": False}
+# --- Pool sizing (unset knobs fall back to per-backend defaults in _pool_defaults) ---
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+# SQLITE_READ_POOL_SIZE is the older name for DB_POOL_SIZE, kept as an alias
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE")
+if DB_POOL_SIZE is None:
+    DB_POOL_SIZE = _env_int("SQLITE_READ_POOL_SIZE")
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW")
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))  # seconds; -1 never recycles
+DB_REPLICA_POOL_SIZE = _env_int("DB_REPLICA_POOL_SIZE")
+if DB_REPLICA_POOL_SIZE is None:
+    DB_REPLICA_POOL_SIZE = DB_POOL_SIZE
+DB_REPLICA_MAX_OVERFLOW = _env_int("DB_REPLICA_MAX_OVERFLOW")
+if DB_REPLICA_MAX_OVERFLOW is None:
+    DB_REPLICA_MAX_OVERFLOW = DB_MAX_OVERFLOW
+# How long a user's reads stay on the primary after their own write (replication lag budget)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# --- SQLite production profile (SQLITE_TUNED=0 falls back to driver defaults) ---
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "1") == "1"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB, i.e. 64 MiB
+SQLITE_WRITER_TIMEOUT = float(os.getenv("SQLITE_WRITER_TIMEOUT", "30"))  # seconds to wait for the writer
+
+def _is_sqlite_file(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers proceed while the writer commits; NORMAL sync is safe under WAL."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+    cursor.close()
+
+# Threads that can hold a connection at once: anyio's default limit, which
+# FastAPI uses for sync handlers, plus APScheduler's default executor pool
+WORKER_THREADS = 40 + 10
+
+def _pool_defaults(database_url: str, pool_size: Optional[int], max_overflow: Optional[int]):
+    """Fill unset pool knobs for this backend.
+
+    Sync handlers keep their connection until the response is serialized on
+    a worker thread, so pool_size + max_overflow must cover WORKER_THREADS on
+    every backend, or requests holding threads starve those holding connections.
+    SQLite file: 40 + 20. SQLite connections are cheap, so err large.
+    Server databases: 10 kept open, overflow up to the thread count. Overflow
+    connections close when returned, so idle workers hold only 10 against
+    the server's max_connections.
+    """
+    if _is_sqlite_file(database_url):
+        pool_size = 40 if pool_size is None else pool_size
+        max_overflow = pool_size // 2 if max_overflow is None else max_overflow
+    else:
+        pool_size = 10 if pool_size is None else pool_size
+        max_overflow = max(WORKER_THREADS - pool_size, 0) if max_overflow is None else max_overflow
+    return pool_size, max_overflow
+
+def _make_engine(
+    database_url: str,
+    pool_size: Optional[int],
+    max_overflow: Optional[int],
+    pool_timeout: float = DB_POOL_TIMEOUT,
+):
+    is_sqlite = make_url(database_url).get_backend_name() == "sqlite"
+    is_sqlite_file = _is_sqlite_file(database_url)
+    pool_size, max_overflow = _pool_defaults(database_url, pool_size, max_overflow)
+    connect_args = {}
+    pool_args = {}
+    if is_sqlite:
+        connect_args = {"check_same_thread": False}
+    if is_sqlite_file or not is_sqlite:
+        pool_args = dict(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    new_engine = create_engine(database_url, connect_args=connect_args, **pool_args)
+    if is_sqlite_file and SQLITE_TUNED:
+        event.listen(new_engine, "connect", _apply_sqlite_pragmas)
+    return new_engine
+
+# --- Primary ---
+# All writes go through one connection so they queue in the pool instead of
+# fighting over the SQLite write lock; reads use the pooled `engine`.
+engine = _make_engine(DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW)
+if _is_sqlite_file(DATABASE_URL):
+    writer_engine = _make_engine(DATABASE_URL, 1, 0, pool_timeout=SQLITE_WRITER_TIMEOUT)
+else:
+    writer_engine = engine
+
+# --- Read replicas (fall back to the primary read pool) ---
+replica_engines = [
+    _make_engine(u, DB_REPLICA_POOL_SIZE, DB_REPLICA_MAX_OVERFLOW) for u in DATABASE_REPLICA_URLS
+] or [engine]
+_replica_cycle = itertools.cycle(replica_engines)
+_replica_lock = threading.Lock()
+
+def _next_replica():
+    with _replica_lock:
+        return next(_replica_cycle)
+
+class RoutingSession(Session):
+    """Reads from one replica for the session's lifetime; anything that writes goes to the primary."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = _next_replica()
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            return writer_engine
+        return self.replica
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: returning a just-committed object must not re-check out the writer
+WriteSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=writer_engine)
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=RoutingSession)
+
+# --- Read-your-writes: user_id -> monotonic time of that user's last write ---
+_recent_writes: Dict[int, float] = {}
+_route_counts = {"replica": 0, "primary": 0}
+_route_counts_lock = threading.Lock()
+
+def _count_route(target: str) -> None:
+    with _route_counts_lock:
+        _route_counts[target] += 1
+
+def mark_user_write(user_id: int) -> None:
+    """Pin this user's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    now = time.monotonic()
+    _recent_writes[user_id] = now
+    if len(_recent_writes) > 10000:
+        for uid, at in list(_recent_writes.items()):
+            if now - at > READ_YOUR_WRITES_SECONDS:
+                _recent_writes.pop(uid, None)
+
+def _wrote_recently(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    at = _recent_writes.get(user_id)
+    return at is not None and time.monotonic() - at <= READ_YOUR_WRITES_SECONDS
+
+
+# --- FastAPI dependencies ---
+def get_db():
+    """Session for read-only handlers, served by a replica."""
+    _count_route("replica")
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_user_db(user_id: int):
+    """Read session for a user's own data; stays on the primary right after their writes."""
+    if _wrote_recently(user_id):
+        _count_route("primary")
+        db = SessionLocal()
+    else:
+        _count_route("replica")
+        db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_write_db():
+    """Session for handlers that insert/update/delete."""
+    db = WriteSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _route_counts_snapshot() -> Dict:
+    with _route_counts_lock:
+        return dict(_route_counts)
+
+def _pool_stats(pool) -> Dict:
+    stats = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    return stats
+
+def pool_metrics() -> Dict:
+    """Snapshot of connection pools and read routing counts."""
+    return {
+        "primary": _pool_stats(engine.pool),
+        "writer": _pool_stats(writer_engine.pool) if writer_engine is not engine else None,
+        "replicas": [
+            {"url": e.url.render_as_string(hide_password=True), **_pool_stats(e.pool)}
+            for e in replica_engines if e is not engine
+        ],
+        "reads_routed": _route_counts_snapshot(),
+        "users_pinned_to_primary": sum(1 for uid in list(_recent_writes) if _wrote_recently(uid)),
+    }
+
 
+def init_db():
+    """Create any missing tables. Run explicitly (migrate.py) in production."""
+    from app.models import Base
+    Base.metadata.create_all(bind=writer_engine)
@@ -0,0 +1,27 @@
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select
+from typing import List, Type
+import os
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to pydantic-core encoding
+    orjson = None
+
+# Run rows through the schema's TypeAdapter even when orjson is available (catches schema drift)
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "0") == "1"
+
+def select_columns(model, schema: Type[BaseModel]):
+    """SELECT exactly the columns a response schema needs; rows come back as tuples, not ORM objects."""
+    return select(*[getattr(model, name) for name in schema.model_fields])
+
+def rows_as_dicts(result) -> List[dict]:
+    return [row._asdict() for row in result]
+
+def rows_response(rows: List[dict], adapter: TypeAdapter) -> Response:
+    """Encode plain row dicts straight to JSON, bypassing FastAPI's per-row response_model pass."""
+    if orjson is not None and not VALIDATE_RESPONSES:
+        return ORJSONResponse(rows)
+    return Response(adapter.dump_json(adapter.validate_python(rows)), media_type="application/json")
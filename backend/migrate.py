@@ -0,0 +1,8 @@
+from app.utils.db import init_db, DATABASE_URL
+
+def run_migrations():
+    init_db()
+    print(f"Schema is up to date ({DATABASE_URL}).")
+
+if __name__ == "__main__":
+    run_migrations()
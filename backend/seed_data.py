@@ -1,11 +1,20 @@
-from app.models import Base, Organization, Team, User, Alert, SeverityEnum, DeliveryTypeEnum, VisibilityTypeEnum
-from app.utils.db import engine, SessionLocal
+from app.models import Organization, Team, User, Alert, SeverityEnum, DeliveryTypeEnum, VisibilityTypeEnum
+from app.utils.db import init_db, SessionLocal, WriteSessionLocal
 from datetime import datetime, timedelta
 
-Base.metadata.create_all(bind=engine)
+def seed_if_empty():
+    """Seed demo data only if the database has no teams yet."""
+    db = SessionLocal()
+    try:
+        empty = db.query(Team).first() is None
+    finally:
+        db.close()
+    if empty:
+        run_seed()
 
 def run_seed():
-    db = SessionLocal()
+    init_db()
+    db = WriteSessionLocal()
     # Clear existing data
     db.query(Alert).delete()
     db.query(User).delete()
@@ -0,0 +1,89 @@
+import asyncio
+import json
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+# --- Minimal in-process ASGI client (no sockets, no extra dependencies) ---
+class ASGIClient:
+    """Drives an ASGI app directly, one HTTP request per call."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lifespan = None
+
+    async def startup(self) -> None:
+        """Run the app's lifespan startup (e.g. scheduler start)."""
+        inbox: asyncio.Queue = asyncio.Queue()
+        outbox: asyncio.Queue = asyncio.Queue()
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        task = asyncio.ensure_future(self.app(scope, inbox.get, outbox.put))
+        await inbox.put({"type": "lifespan.startup"})
+        message = await outbox.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"Lifespan startup failed: {message.get('message', message)}")
+        self._lifespan = (task, inbox, outbox)
+
+    async def shutdown(self) -> None:
+        if self._lifespan is None:
+            return
+        task, inbox, outbox = self._lifespan
+        self._lifespan = None
+        await inbox.put({"type": "lifespan.shutdown"})
+        await outbox.get()
+        await task
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+    ) -> Tuple[int, bytes]:
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        headers = [(b"host", b"loadtest")]
+        if json_body is not None:
+            headers.append((b"content-type", b"application/json"))
+            headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}).encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+        }
+        sent = False
+        status = 0
+        chunks = []
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+    async def get(self, path: str, **params) -> Tuple[int, bytes]:
+        return await self.request("GET", path, params=params)
+
+    async def put(self, path: str, **params) -> Tuple[int, bytes]:
+        return await self.request("PUT", path, params=params)
+
+    async def post(self, path: str, json_body: Any) -> Tuple[int, bytes]:
+        return await self.request("POST", path, json_body=json_body)
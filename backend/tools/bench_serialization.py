@@ -0,0 +1,89 @@
+"""Serialization benchmark: ORM + response_model vs column selects + direct encoding.
+
+Seeds N alerts into a throwaway SQLite file and times GET requests over ASGI
+against three paths:
+  * orm         - the previous path: db.query(Alert).all() validated through
+                  response_model=List[AlertOut] by FastAPI
+  * fast        - GET /admin/alerts: column-only select encoded with orjson
+  * validated   - GET /admin/alerts with VALIDATE_RESPONSES on (TypeAdapter)
+
+Usage (from ``backend/``):
+    python -m tools.bench_serialization --rows 10000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AlertSphere list serialization benchmark")
+    parser.add_argument("--rows", type=int, default=10000, help="alerts to seed")
+    parser.add_argument("--repeat", type=int, default=7, help="requests per path (best and median reported)")
+    args = parser.parse_args(argv)
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="alertsphere-bench-"), "bench.db")
+    from fastapi import Depends
+    from sqlalchemy.orm import Session
+    from app.main import app
+    from app.models import Alert
+    from app.schemas import AlertOut
+    from app.utils import responses
+    from app.utils.db import WriteSessionLocal, get_db
+    from tools.asgi_client import ASGIClient
+
+    db = WriteSessionLocal()
+    now = datetime.utcnow()
+    db.add_all([
+        Alert(
+            title=f"Bench alert {i}",
+            message="Benchmark payload " * 4,
+            start_time=now,
+            expiry_time=now + timedelta(days=1),
+            organization_id=1,
+        )
+        for i in range(args.rows)
+    ])
+    db.commit()
+    db.close()
+
+    # The pre-fast-path implementation, kept here only as the baseline
+    @app.get("/bench/alerts-orm", response_model=List[AlertOut])
+    def alerts_orm(db: Session = Depends(get_db)):
+        return db.query(Alert).all()
+
+    client = ASGIClient(app)
+
+    async def time_path(path: str):
+        timings, size = [], 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            status, body = await client.get(path)
+            timings.append(time.perf_counter() - start)
+            assert status == 200, (path, status)
+            size = len(body)
+        timings.sort()
+        return timings[0], timings[len(timings) // 2], size
+
+    async def run():
+        results = {"orm": await time_path("/bench/alerts-orm"), "fast": await time_path("/admin/alerts")}
+        responses.VALIDATE_RESPONSES = True
+        results["validated"] = await time_path("/admin/alerts")
+        responses.VALIDATE_RESPONSES = False
+        return results
+
+    results = asyncio.run(run())
+    baseline = results["orm"][1]
+    print(f"GET alerts list, {args.rows + 3} rows, {args.repeat} requests per path"
+          f" (orjson {'available' if responses.orjson else 'missing'})")
+    print(f"{'path':<12}{'best ms':>10}{'median ms':>12}{'bytes':>12}{'speedup':>10}")
+    print("-" * 56)
+    for name, (best, median, size) in results.items():
+        print(f"{name:<12}{best * 1000:>10.1f}{median * 1000:>12.1f}{size:>12}{baseline / median:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
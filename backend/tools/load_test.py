@@ -0,0 +1,301 @@
+"""In-process load harness for AlertSphere.
+
+Simulates dashboard tabs polling the API over ASGI while ``reminder_job``
+sweeps run concurrently, then reports throughput and latency percentiles
+per endpoint.
+
+Usage (from ``backend/``):
+    python -m tools.load_test --clients 2000 --admin-clients 20 --duration 60
+
+The default temp database is seeded with ``--users``/``--teams``/``--alerts``
+on top of the demo data, so tabs poll as distinct users and each sweep
+fans out at a realistic scale.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(samples))))
+    return samples[min(rank, len(samples)) - 1]
+
+
+class Stats:
+    """Collects latencies (seconds) and failures keyed by endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.sweeps: List[float] = []
+        self.sweep_errors: List[str] = []
+
+    def record(self, endpoint: str, elapsed: float, ok: bool) -> None:
+        self.latencies[endpoint].append(elapsed)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self, wall: float) -> str:
+        lines = [
+            f"{'endpoint':<32}{'count':>8}{'err':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}",
+            "-" * 82,
+        ]
+        total = 0
+        for endpoint in sorted(self.latencies):
+            samples = sorted(self.latencies[endpoint])
+            total += len(samples)
+            lines.append(
+                f"{endpoint:<32}{len(samples):>8}{self.errors[endpoint]:>6}"
+                f"{len(samples) / wall:>9.1f}"
+                f"{percentile(samples, 50) * 1000:>9.1f}"
+                f"{percentile(samples, 95) * 1000:>9.1f}"
+                f"{percentile(samples, 99) * 1000:>9.1f}"
+            )
+        lines.append("-" * 82)
+        lines.append(f"total requests: {total} in {wall:.1f}s ({total / wall:.1f} req/s)")
+        sweeps = sorted(self.sweeps)
+        lines.append(
+            f"reminder sweeps: {len(sweeps)} completed, {len(self.sweep_errors)} failed"
+            + (f", p50 {percentile(sweeps, 50):.2f}s, max {sweeps[-1]:.2f}s" if sweeps else "")
+        )
+        for err in self.sweep_errors[:5]:
+            lines.append(f"  sweep error: {err}")
+        return "\n".join(lines)
+
+
+async def timed(stats: Stats, endpoint: str, call):
+    start = time.perf_counter()
+    try:
+        status, body = await call
+        ok = status < 400
+    except Exception:
+        # Unhandled errors (e.g. "database is locked") surface as exceptions in-process
+        body, ok = b"", False
+    stats.record(endpoint, time.perf_counter() - start, ok)
+    return body if ok else None
+
+
+async def user_tab(client, stats: Stats, args, ctx, deadline: float):
+    """One browser tab polling /user/alerts and occasionally acting on an alert."""
+    rng = random.Random()
+    user_id = rng.choice(ctx["user_ids"])
+    await asyncio.sleep(rng.uniform(0, args.interval))
+    while time.perf_counter() < deadline:
+        await timed(stats, "GET /user/alerts", client.get("/user/alerts", user_id=user_id))
+        await timed(stats, "GET /user/alerts/snoozed", client.get("/user/alerts/snoozed", user_id=user_id))
+        if ctx["alert_ids"] and rng.random() < args.write_ratio:
+            action = rng.choices(["read", "snooze", "create"], weights=args.write_mix)[0]
+            if action == "read":
+                alert_id = rng.choice(ctx["alert_ids"])
+                await timed(stats, "PUT /user/alerts/{id}/read",
+                            client.put(f"/user/alerts/{alert_id}/read", user_id=user_id))
+            elif action == "snooze":
+                alert_id = rng.choice(ctx["alert_ids"])
+                await timed(stats, "PUT /user/alerts/{id}/snooze",
+                            client.put(f"/user/alerts/{alert_id}/snooze", user_id=user_id))
+            else:
+                now = datetime.utcnow()
+                payload = {
+                    "title": f"Load test alert {rng.randint(0, 1_000_000)}",
+                    "message": "Generated by tools.load_test",
+                    "start_time": (now - timedelta(minutes=1)).isoformat(),
+                    "expiry_time": (now + timedelta(hours=1)).isoformat(),
+                    "visibility_type": "Organization",
+                    "organization_id": ctx["org_id"],
+                }
+                await timed(stats, "POST /admin/alerts", client.post("/admin/alerts", payload))
+        await asyncio.sleep(args.interval)
+
+
+async def admin_tab(client, stats: Stats, args, deadline: float):
+    """One admin dashboard polling the alert list and analytics."""
+    await asyncio.sleep(random.uniform(0, args.interval))
+    while time.perf_counter() < deadline:
+        await timed(stats, "GET /admin/alerts", client.get("/admin/alerts"))
+        await timed(stats, "GET /admin/analytics", client.get("/admin/analytics"))
+        await asyncio.sleep(args.interval)
+
+
+async def sweeper(stats: Stats, args, deadline: float):
+    """Runs reminder_job on a worker thread, as APScheduler would, for the whole run."""
+    from app.services.scheduler import reminder_job
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(reminder_job)
+            stats.sweeps.append(time.perf_counter() - start)
+        except Exception as exc:
+            stats.sweep_errors.append(repr(exc))
+        await asyncio.sleep(args.sweep_interval)
+
+
+def seed_scale(users: int, teams: int, alerts: int) -> None:
+    """Bulk-add teams, users and active alerts (with their link rows) under the first organization.
+
+    Alerts are split 1:2:1 across org, team and user visibility and link to
+    the same rows create_alert would write.
+    """
+    from sqlalchemy import insert, select
+    from app.models import (
+        Alert, AlertTeam, AlertUser, DeliveryTypeEnum, Organization, SeverityEnum, Team, User, VisibilityTypeEnum,
+    )
+    from app.services.membership import membership_cache
+    from app.utils.db import WriteSessionLocal
+
+    rng = random.Random(0)
+    db = WriteSessionLocal()
+    try:
+        org_id = db.execute(select(Organization.id).order_by(Organization.id)).scalars().first()
+        if org_id is None:
+            raise SystemExit("Database has no organization to seed under; seed it first (python seed_data.py)")
+        if teams:
+            first_team = (db.execute(select(Team.id).order_by(Team.id.desc())).scalars().first() or 0) + 1
+            db.execute(insert(Team), [
+                {"name": f"Load Team {first_team + i}", "organization_id": org_id} for i in range(teams)
+            ])
+        team_ids = list(db.execute(select(Team.id).where(Team.organization_id == org_id)).scalars())
+        if users:
+            if not team_ids:
+                raise SystemExit("No teams to put seeded users in; pass --teams")
+            db.execute(insert(User), [
+                {"name": f"Load User {i}", "team_id": rng.choice(team_ids)} for i in range(users)
+            ])
+        members: Dict[int, List[int]] = defaultdict(list)
+        user_team: Dict[int, int] = {}
+        for user_id, team_id in db.execute(select(User.id, User.team_id).where(User.team_id.in_(team_ids))):
+            members[team_id].append(user_id)
+            user_team[user_id] = team_id
+        all_users = list(user_team)
+
+        now = datetime.utcnow()
+        first_alert = (db.execute(select(Alert.id).order_by(Alert.id.desc())).scalars().first() or 0) + 1
+        alert_rows, team_links, user_links = [], [], []
+        for i in range(alerts):
+            alert_id = first_alert + i
+            visibility = rng.choices(
+                [VisibilityTypeEnum.org, VisibilityTypeEnum.team, VisibilityTypeEnum.user], weights=[1, 2, 1]
+            )[0]
+            row = {
+                "id": alert_id,
+                "title": f"Load alert {alert_id}",
+                "message": "Seeded by tools.load_test",
+                "severity": rng.choices(list(SeverityEnum), weights=[8, 3, 1])[0],
+                "delivery_type": DeliveryTypeEnum.in_app,
+                "reminder_frequency": 2,
+                "start_time": now - timedelta(minutes=5),
+                "expiry_time": now + timedelta(days=1),
+                "visibility_type": visibility,
+                "organization_id": org_id,
+                "team_id": None,
+                "user_id": None,
+                "is_active": True,
+                "archived": False,
+            }
+            if visibility == VisibilityTypeEnum.org:
+                team_links += [{"alert_id": alert_id, "team_id": t} for t in team_ids]
+                user_links += [{"alert_id": alert_id, "user_id": u} for u in all_users]
+            elif visibility == VisibilityTypeEnum.team and team_ids:
+                row["team_id"] = rng.choice(team_ids)
+                team_links.append({"alert_id": alert_id, "team_id": row["team_id"]})
+                user_links += [{"alert_id": alert_id, "user_id": u} for u in members[row["team_id"]]]
+            elif visibility == VisibilityTypeEnum.user and all_users:
+                row["user_id"] = rng.choice(all_users)
+                row["team_id"] = user_team[row["user_id"]]
+                user_links.append({"alert_id": alert_id, "user_id": row["user_id"]})
+            alert_rows.append(row)
+        for model, rows in ((Alert, alert_rows), (AlertTeam, team_links), (AlertUser, user_links)):
+            if rows:
+                db.execute(insert(model), rows)
+        db.commit()
+    finally:
+        db.close()
+    # Bulk inserts skip the ORM events that invalidate the membership cache
+    membership_cache.invalidate()
+    print(f"seeded: {teams} teams, {users} users, {alerts} alerts "
+          f"({len(team_links)} team links, {len(user_links)} user links)")
+
+
+async def run(args):
+    from app.main import app
+    from tools.asgi_client import ASGIClient
+
+    if args.users or args.teams or args.alerts:
+        seed_scale(args.users, args.teams, args.alerts)
+    client = ASGIClient(app)
+    _, body = await client.get("/admin/users")
+    user_ids = [u["id"] for u in json.loads(body)]
+    _, body = await client.get("/admin/alerts")
+    alert_ids = [a["id"] for a in json.loads(body)]
+    _, body = await client.get("/admin/organizations")
+    orgs = json.loads(body)
+    if not user_ids or not orgs:
+        raise SystemExit("Database has no users/organizations; seed it first (python seed_data.py)")
+    ctx = {"user_ids": user_ids, "alert_ids": alert_ids, "org_id": orgs[0]["id"]}
+
+    stats = Stats()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    tasks = [user_tab(client, stats, args, ctx, deadline) for _ in range(args.clients)]
+    tasks += [admin_tab(client, stats, args, deadline) for _ in range(args.admin_clients)]
+    if not args.no_sweep:
+        tasks.append(sweeper(stats, args, deadline))
+    await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - start
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AlertSphere in-process polling load test")
+    parser.add_argument("--clients", type=int, default=1000, help="simulated user dashboard tabs")
+    parser.add_argument("--admin-clients", type=int, default=10, help="simulated admin dashboard tabs")
+    parser.add_argument("--interval", type=float, default=10.0, help="poll interval per tab (seconds)")
+    parser.add_argument("--duration", type=float, default=60.0, help="run length (seconds)")
+    parser.add_argument("--write-ratio", type=float, default=0.05,
+                        help="probability that a user poll is followed by a write")
+    parser.add_argument("--write-mix", type=lambda s: [float(w) for w in s.split(",")], default=[0.6, 0.3, 0.1],
+                        help="relative weights for read,snooze,create writes (default 0.6,0.3,0.1)")
+    parser.add_argument("--sweep-interval", type=float, default=0.0,
+                        help="pause between reminder sweeps (seconds); 0 runs them back to back")
+    parser.add_argument("--no-sweep", action="store_true", help="disable the concurrent reminder sweep")
+    parser.add_argument("--database-url", default=None,
+                        help="database to load (default: a fresh seeded SQLite file in a temp dir)")
+    parser.add_argument("--users", type=int, default=None,
+                        help="extra users to seed before the run (default: 2000 on the temp database, else 0)")
+    parser.add_argument("--teams", type=int, default=None,
+                        help="extra teams to seed, users spread across them (default: 40 on the temp database, else 0)")
+    parser.add_argument("--alerts", type=int, default=None,
+                        help="extra active alerts to seed (default: 100 on the temp database, else 0)")
+    args = parser.parse_args(argv)
+    # Scale the fresh temp database by default; never grow a database passed in unless asked
+    for name, default in (("users", 2000), ("teams", 40), ("alerts", 100)):
+        if getattr(args, name) is None:
+            setattr(args, name, default if args.database_url is None else 0)
+    if len(args.write_mix) != 3:
+        parser.error("--write-mix needs three comma-separated weights")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.database_url is None:
+        args.database_url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="alertsphere-load-"), "load.db")
+    # Must be set before app.utils.db is imported
+    os.environ["DATABASE_URL"] = args.database_url
+    print(f"database: {args.database_url}")
+    print(f"clients: {args.clients} user + {args.admin_clients} admin, every {args.interval}s for {args.duration}s")
+    stats, wall = asyncio.run(run(args))
+    print(stats.report(wall))
+
+
+if __name__ == "__main__":
+    main()
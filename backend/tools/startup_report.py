@@ -0,0 +1,151 @@
+"""Startup-time report for AlertSphere.
+
+Measures, in fresh interpreters:
+  * import time per module for ``app.main`` (via ``python -X importtime``)
+  * time from process spawn to the first successful HTTP response
+
+Usage (from ``backend/``):
+    python -m tools.startup_report --target-ms 1500
+Runs against a freshly migrated SQLite file in a temp dir unless
+``--database-url`` is given. Exits non-zero when time to first request
+exceeds ``--target-ms``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+FIRST_REQUEST_SNIPPET = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+from app.main import app
+t_import = time.perf_counter()
+from tools.asgi_client import ASGIClient
+
+async def first_request():
+    client = ASGIClient(app)
+    await client.startup()
+    t_startup = time.perf_counter()
+    status, _ = await client.get(sys.argv[1])
+    t_first = time.perf_counter()
+    wall_first = time.time()
+    await client.shutdown()
+    return status, t_startup, t_first, wall_first
+
+status, t_startup, t_first, wall_first = asyncio.run(first_request())
+print(json.dumps({
+    "status": status,
+    "import_s": t_import - t0,
+    "lifespan_s": t_startup - t_import,
+    "request_s": t_first - t_startup,
+    "wall_first": wall_first,
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Return (module, depth, self_us, cumulative_us) rows from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def import_times(env) -> List[Tuple[str, int, int, int]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import app.main failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def migrate(env) -> None:
+    proc = subprocess.run([sys.executable, "migrate.py"], env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"migrate.py failed:\n{proc.stderr[-2000:]}")
+
+
+def time_to_first_request(env, path: str) -> dict:
+    start = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST_SNIPPET, path],
+        env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        if "no such table" in proc.stderr:
+            raise SystemExit(
+                f"first request failed: the schema is missing in {env['DATABASE_URL']}; "
+                "run migrate.py first (or omit --database-url to use a migrated temp database)"
+            )
+        raise SystemExit(f"first request failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["spawn_to_first_s"] = result.pop("wall_first") - start
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AlertSphere startup-time report")
+    parser.add_argument("--app-env", default="production", help="APP_ENV to boot with (default: production)")
+    parser.add_argument("--path", default="/", help="path for the first request (default: /)")
+    parser.add_argument("--top", type=int, default=25, help="slowest modules to list, nested imports included (by cumulative time)")
+    parser.add_argument("--target-ms", type=float, default=None, help="fail if time to first request exceeds this")
+    parser.add_argument("--database-url", default=None,
+                        help="database to boot against, already migrated (default: a fresh migrated SQLite file in a temp dir)")
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="alertsphere-startup-"), "startup.db")
+    env = dict(os.environ, APP_ENV=args.app_env, DATABASE_URL=database_url)
+    if args.database_url is None:
+        # Schema is applied before deploy, so it stays outside the measurement
+        migrate(env)
+    rows = import_times(env)
+    # Self times never double count, so they sum per package and to the total
+    by_package = {}
+    for name, _, self_us, _ in rows:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    total_us = sum(by_package.values())
+
+    print(f"APP_ENV={args.app_env}")
+    print(f"database: {database_url}")
+    print(f"\nimport app.main: {total_us / 1000:.1f} ms total")
+    print(f"{'module':<40}{'cumulative ms':>15}{'self ms':>10}")
+    print("-" * 65)
+    # Per-module listing includes nested imports so slow leaves are visible too
+    for name, _, self_us, cumulative_us in sorted(rows, key=lambda r: -r[3])[:args.top]:
+        print(f"{name:<40}{cumulative_us / 1000:>15.1f}{self_us / 1000:>10.1f}")
+    print(f"\n{'package':<40}{'self ms':>15}")
+    print("-" * 55)
+    for package, package_self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"{package:<40}{package_self_us / 1000:>15.1f}")
+
+    first = time_to_first_request(env, args.path)
+    print(f"\nfirst request: GET {args.path} -> {first['status']}")
+    print(f"  import app.main   {first['import_s'] * 1000:>9.1f} ms")
+    print(f"  lifespan startup  {first['lifespan_s'] * 1000:>9.1f} ms")
+    print(f"  first request     {first['request_s'] * 1000:>9.1f} ms")
+    print(f"  spawn -> response {first['spawn_to_first_s'] * 1000:>9.1f} ms")
+
+    if args.target_ms is not None:
+        elapsed_ms = first["spawn_to_first_s"] * 1000
+        if elapsed_ms > args.target_ms:
+            print(f"\nFAIL: time to first request {elapsed_ms:.1f} ms exceeds target {args.target_ms:.1f} ms")
+            sys.exit(1)
+        print(f"\nOK: within target of {args.target_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
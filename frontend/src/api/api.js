@@ -16,6 +16,6 @@ export const getUsers = async () => fetch(`${BASE_URL}/admin/users`).then(r => r
 // User APIs
 export const getUserAlerts = async (userId) => fetch(`${BASE_URL}/user/alerts?user_id=${userId}`).then(r => r.json());
 export const markAlertRead = async (id, userId, read=true) => fetch(`${BASE_URL}/user/alerts/${id}/read?user_id=${userId}&read=${read}`, { method: 'PUT' }).then(r => r.json());
-export const snoozeAlert = async (id, userId) => fetch(`${BASE_URL}/user/alerts/${id}/snooze?user_id=${userId}`, { method: 'PUT' }).then(r => r.json());
+export const snoozeAlert = async (id, userId, minutes) => fetch(`${BASE_URL}/user/alerts/${id}/snooze?user_id=${userId}${minutes ? `&minutes=${minutes}` : ''}`, { method: 'PUT' }).then(r => r.json());
 export const getSnoozedAlerts = async (userId) => fetch(`${BASE_URL}/user/alerts/snoozed?user_id=${userId}`).then(r => r.json());
 